@@ -1,41 +1,84 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
-import pymongo
-from pymongo import MongoClient
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+import asyncio
 import os
+import time
 import jwt
 import bcrypt
+import hashlib
+import orjson
 import uuid
 from enum import Enum
+from types import MappingProxyType
+from cachetools import TTLCache
+import redis.asyncio as aioredis
 
 # Initialize FastAPI app
-app = FastAPI(title="Bhangaar Waala API", version="1.0.0")
+app = FastAPI(title="Bhangaar Waala API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS middleware
+# Pin the origin and cache preflights for a day so browsers stop sending an
+# OPTIONS round-trip per API call
+FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[FRONTEND_URL],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
+# Compress JSON responses over 1KB for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Database connection
+# Pool sized for a per-core worker layout; zstd/zlib compression trims the
+# joined get_pickups payloads on the wire (zlib is the fallback when the
+# server lacks zstd support)
 MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017/')
-client = MongoClient(MONGO_URL)
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=50,
+    minPoolSize=5,
+    compressors="zstd,zlib",
+    retryWrites=True,
+    serverSelectionTimeoutMS=2000,
+)
 db = client.bhangaar_waala
 
 # JWT settings
 SECRET_KEY = "bhangaar_waala_secret_key_2025"
+SECRET_BYTES = SECRET_KEY.encode()
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# One codec instance reused across requests instead of the module-level
+# jwt.encode/decode helpers that rebuild state per call
+_jwt = jwt.PyJWT()
+
 security = HTTPBearer()
 
+# Short-lived auth cache so repeat requests skip JWT decode + user fetch
+_auth_cache = TTLCache(maxsize=10000, ttl=30)
+# user_id -> set of token hashes, for invalidation. Same TTL as the forward
+# cache (refreshed on every auth) so entries for idle users age out instead
+# of accumulating for the life of the worker.
+_auth_cache_keys = TTLCache(maxsize=10000, ttl=30)
+
+# With REDIS_URL set, workers and replicas share auth cache hits and user
+# revocations; without it the per-process TTL cache above still applies
+REDIS_URL = os.environ.get('REDIS_URL')
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL else None
+
 # Enums
 class UserRole(str, Enum):
     HOUSEHOLD = "household"
@@ -56,6 +99,27 @@ class PickupStatus(str, Enum):
     COLLECTED = "collected"
     FAILED = "failed"
 
+# Eco points granted per waste type on collection; frozen at import so the
+# hot status-update path never rebuilds it
+_POINTS_MAP = MappingProxyType({
+    WasteType.DRY: 10,
+    WasteType.WET: 5,
+    WasteType.ELECTRONIC: 25,
+    WasteType.MEDICAL: 20,
+    WasteType.RECYCLABLE: 15
+})
+_DEFAULT_POINTS = 10
+
+# Role -> pickups filter, built once at import so the dashboard poll doesn't
+# reconstruct the branch logic per request; admin (match-all) is the fallback
+# to mirror the old else branch
+_ADMIN_QUERY = {}
+_ROLE_QUERY = {
+    UserRole.HOUSEHOLD.value: lambda user: {"user_id": user["id"]},
+    UserRole.COLLECTOR.value: lambda user: {"$or": [{"collector_id": user["id"]}, {"status": "pending"}]},
+    UserRole.ADMIN.value: lambda user: _ADMIN_QUERY,
+}
+
 # Pydantic models
 class UserBase(BaseModel):
     email: str
@@ -96,6 +160,13 @@ class Pickup(PickupRequest):
     rating: Optional[int] = None
     feedback: Optional[str] = None
 
+class RatingRequest(BaseModel):
+    rating: int = Field(ge=1, le=5)
+    feedback: Optional[str] = Field(default=None, max_length=1000)
+
+class MessageRequest(BaseModel):
+    message: str = Field(min_length=1, max_length=4000)
+
 class CollectorStats(BaseModel):
     total_pickups: int
     completed_pickups: int
@@ -111,34 +182,111 @@ class ChatMessage(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
 # Helper functions
-def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# bcrypt is CPU-bound (~100-200ms per call), so run it in a worker thread
+# to keep the event loop free during register/login bursts
+async def hash_password(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    hashed = await loop.run_in_executor(None, bcrypt.hashpw, password.encode('utf-8'), bcrypt.gensalt())
+    return hashed.decode('utf-8')
 
-def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Epoch seconds directly: JWT claims are numeric anyway, so skip the
+    # datetime/timedelta allocations
+    now = int(time.time())
+    to_encode.update({"exp": now + ACCESS_TOKEN_EXPIRE_MINUTES * 60, "iat": now})
+    encoded_jwt = _jwt.encode(to_encode, SECRET_BYTES, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token_hash = hashlib.sha256(credentials.credentials.encode()).digest()[:16]
+    cached = _auth_cache.get(token_hash)
+    if cached is not None:
+        user, exp = cached
+        if exp > time.time():
+            return user
+
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        user = db.users.find_one({"id": user_id})
-        if user is None:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+        payload = _jwt.decode(credentials.credentials, SECRET_BYTES, algorithms=[ALGORITHM])
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    user = None
+    redis_up = redis_client is not None
+    if redis_up:
+        redis_key = f"auth:{token_hash.hex()}"
+        try:
+            cached_bytes, revoked_at = await redis_client.mget(redis_key, f"revoked:{user_id}")
+        except aioredis.RedisError:
+            # Redis is a cache, not a dependency: fall through to Mongo
+            redis_up = False
+            cached_bytes = revoked_at = None
+        if revoked_at is not None and float(revoked_at) >= payload.get("iat", 0):
+            cached_bytes = None  # token predates the revocation; refetch from Mongo
+        if cached_bytes is not None:
+            user = orjson.loads(cached_bytes)
+
+    if user is None:
+        user = await db.users.find_one({"id": user_id}, {"_id": 0})
+        if user is None:
+            raise HTTPException(status_code=401, detail="User not found")
+        if redis_up:
+            try:
+                await redis_client.setex(redis_key, 30, orjson.dumps(user, default=str))
+            except aioredis.RedisError:
+                pass  # best-effort cache write
+
+    _auth_cache[token_hash] = (user, payload.get("exp", 0))
+    hashes = _auth_cache_keys.get(user_id)
+    if hashes is None:
+        hashes = set()
+    _auth_cache_keys[user_id] = hashes  # re-set to refresh the TTL
+    hashes.add(token_hash)
+    return user
+
+def stream_json_array(cursor) -> StreamingResponse:
+    # Stream a cursor as a chunked JSON array: O(1) memory and first bytes go
+    # out after the first document instead of after the full result set
+    async def gen():
+        yield b"["
+        first = True
+        async for doc in cursor:
+            yield (b"" if first else b",") + orjson.dumps(doc, default=str)
+            first = False
+        yield b"]"
+    return StreamingResponse(gen(), media_type="application/json")
+
+async def invalidate_auth_cache(user_id: str):
+    for token_hash in _auth_cache_keys.pop(user_id, ()):
+        _auth_cache.pop(token_hash, None)
+    if redis_client is not None:
+        try:
+            await redis_client.set(f"revoked:{user_id}", time.time(), ex=3600)
+        except aioredis.RedisError:
+            # Local cache is already cleared; other workers converge once
+            # their 30s entries expire, so don't fail the admin action
+            pass
 
 # API Routes
 
+@app.on_event("startup")
+async def create_indexes():
+    # Index the hot query fields so lookups stay O(log N) as collections grow
+    await db.users.create_index("email", unique=True)
+    await db.users.create_index("id", unique=True)
+    await db.pickups.create_index("id", unique=True)
+    await db.pickups.create_index([("user_id", 1), ("status", 1)])
+    await db.pickups.create_index([("collector_id", 1), ("status", 1)])
+    await db.pickups.create_index("status")
+    await db.chat_messages.create_index([("pickup_id", 1), ("timestamp", 1)])
+
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
@@ -147,13 +295,13 @@ async def health_check():
 @app.post("/api/register")
 async def register(user_data: UserCreate):
     # Check if user exists
-    existing_user = db.users.find_one({"email": user_data.email})
+    existing_user = await db.users.find_one({"email": user_data.email})
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create user
     user_id = str(uuid.uuid4())
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     
     user_doc = {
         "id": user_id,
@@ -168,7 +316,7 @@ async def register(user_data: UserCreate):
         "created_at": datetime.utcnow()
     }
     
-    db.users.insert_one(user_doc)
+    await db.users.insert_one(user_doc)
     
     # Create access token
     access_token = create_access_token(data={"sub": user_id})
@@ -187,8 +335,8 @@ async def register(user_data: UserCreate):
 
 @app.post("/api/login")
 async def login(user_data: UserLogin):
-    user = db.users.find_one({"email": user_data.email})
-    if not user or not verify_password(user_data.password, user["password"]):
+    user = await db.users.find_one({"email": user_data.email})
+    if not user or not await verify_password(user_data.password, user["password"]):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     
     access_token = create_access_token(data={"sub": user["id"]})
@@ -212,6 +360,7 @@ async def create_pickup(pickup_data: PickupRequest, current_user = Depends(get_c
         raise HTTPException(status_code=403, detail="Only households can create pickups")
     
     pickup_id = str(uuid.uuid4())
+    now = datetime.utcnow()
     pickup_doc = {
         "id": pickup_id,
         "user_id": current_user["id"],
@@ -223,49 +372,55 @@ async def create_pickup(pickup_data: PickupRequest, current_user = Depends(get_c
         "photo_url": pickup_data.photo_url,
         "notes": pickup_data.notes,
         "status": "pending",
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now
     }
     
-    db.pickups.insert_one(pickup_doc)
+    await db.pickups.insert_one(pickup_doc)
     
     return {"message": "Pickup request created", "pickup_id": pickup_id}
 
 @app.get("/api/pickups")
 async def get_pickups(current_user = Depends(get_current_user)):
-    if current_user["role"] == "household":
-        pickups = list(db.pickups.find({"user_id": current_user["id"]}, {"_id": 0}))
-    elif current_user["role"] == "collector":
-        pickups = list(db.pickups.find({"$or": [{"collector_id": current_user["id"]}, {"status": "pending"}]}, {"_id": 0}))
-    else:  # admin
-        pickups = list(db.pickups.find({}, {"_id": 0}))
-    
-    # Add user details to each pickup
-    for pickup in pickups:
-        user = db.users.find_one({"id": pickup["user_id"]}, {"_id": 0, "password": 0})
-        pickup["user"] = user
-        if pickup.get("collector_id"):
-            collector = db.users.find_one({"id": pickup["collector_id"]}, {"_id": 0, "password": 0})
-            pickup["collector"] = collector
-    
-    return pickups
+    role_filter = _ROLE_QUERY.get(current_user["role"], _ROLE_QUERY[UserRole.ADMIN.value])(current_user)
+
+    # Join user and collector details server-side in one round-trip
+    pipeline = [
+        {"$match": role_filter},
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "user_id",
+                "foreignField": "id",
+                "as": "user",
+                "pipeline": [{"$project": {"_id": 0, "password": 0}}]
+            }
+        },
+        {"$unwind": {"path": "$user", "preserveNullAndEmptyArrays": True}},
+        {
+            "$lookup": {
+                "from": "users",
+                "localField": "collector_id",
+                "foreignField": "id",
+                "as": "collector",
+                "pipeline": [{"$project": {"_id": 0, "password": 0}}]
+            }
+        },
+        {"$unwind": {"path": "$collector", "preserveNullAndEmptyArrays": True}},
+        {"$project": {"_id": 0}}
+    ]
+    return stream_json_array(db.pickups.aggregate(pipeline, batchSize=500))
 
 @app.put("/api/pickups/{pickup_id}/assign")
 async def assign_pickup(pickup_id: str, current_user = Depends(get_current_user)):
     if current_user["role"] not in ["collector", "admin"]:
         raise HTTPException(status_code=403, detail="Only collectors and admins can assign pickups")
     
-    pickup = db.pickups.find_one({"id": pickup_id})
-    if not pickup:
-        raise HTTPException(status_code=404, detail="Pickup not found")
-    
-    if pickup["status"] != "pending":
-        raise HTTPException(status_code=400, detail="Pickup already assigned or completed")
-    
     collector_id = current_user["id"] if current_user["role"] == "collector" else None
-    
-    db.pickups.update_one(
-        {"id": pickup_id},
+
+    # Encode the precondition in the filter so check + update is one round-trip
+    pickup = await db.pickups.find_one_and_update(
+        {"id": pickup_id, "status": "pending"},
         {
             "$set": {
                 "collector_id": collector_id,
@@ -274,76 +429,102 @@ async def assign_pickup(pickup_id: str, current_user = Depends(get_current_user)
             }
         }
     )
-    
+    if not pickup:
+        exists = await db.pickups.count_documents({"id": pickup_id}, limit=1)
+        if not exists:
+            raise HTTPException(status_code=404, detail="Pickup not found")
+        raise HTTPException(status_code=400, detail="Pickup already assigned or completed")
+
     return {"message": "Pickup assigned successfully"}
 
 @app.put("/api/pickups/{pickup_id}/status")
 async def update_pickup_status(pickup_id: str, status: PickupStatus, current_user = Depends(get_current_user)):
-    pickup = db.pickups.find_one({"id": pickup_id})
-    if not pickup:
-        raise HTTPException(status_code=404, detail="Pickup not found")
-    
-    # Check permissions
-    if current_user["role"] == "collector" and pickup.get("collector_id") != current_user["id"]:
-        raise HTTPException(status_code=403, detail="You can only update your assigned pickups")
-    
-    db.pickups.update_one(
-        {"id": pickup_id},
-        {
+    # Collectors may only touch their assigned pickups; fold the permission
+    # check into the update filter so check + update is one round-trip
+    query = {"id": pickup_id}
+    if current_user["role"] == "collector":
+        query["collector_id"] = current_user["id"]
+
+    now = datetime.utcnow()
+    if status == PickupStatus.COLLECTED:
+        # Pipeline update: stamp the eco-points award on the pickup in the
+        # same write as the status flip, keyed off the waste type server-side.
+        # Skipped if the pickup was already collected, so the grant is idempotent.
+        update = [{
             "$set": {
                 "status": status,
-                "updated_at": datetime.utcnow()
+                "updated_at": now,
+                "eco_points_awarded": {
+                    "$cond": [
+                        {"$eq": ["$status", "collected"]},
+                        "$eco_points_awarded",
+                        {
+                            "$switch": {
+                                "branches": [
+                                    {"case": {"$eq": ["$waste_type", wt.value]}, "then": pts}
+                                    for wt, pts in _POINTS_MAP.items()
+                                ],
+                                "default": _DEFAULT_POINTS
+                            }
+                        }
+                    ]
+                }
             }
-        }
+        }]
+    else:
+        update = {"$set": {"status": status, "updated_at": now}}
+
+    pickup = await db.pickups.find_one_and_update(
+        query,
+        update,
+        return_document=ReturnDocument.BEFORE
     )
-    
-    # Award eco points if pickup completed
-    if status == "collected":
-        points_map = {
-            "dry": 10,
-            "wet": 5,
-            "electronic": 25,
-            "medical": 20,
-            "recyclable": 15
-        }
-        points = points_map.get(pickup["waste_type"], 10)
-        
-        db.users.update_one(
+    if not pickup:
+        exists = await db.pickups.count_documents({"id": pickup_id}, limit=1)
+        if not exists:
+            raise HTTPException(status_code=404, detail="Pickup not found")
+        raise HTTPException(status_code=403, detail="You can only update your assigned pickups")
+
+    # Credit the household's balance (pre-image guard avoids double grants)
+    if status == PickupStatus.COLLECTED and pickup["status"] != PickupStatus.COLLECTED:
+        try:
+            points = _POINTS_MAP[WasteType(pickup["waste_type"])]
+        except ValueError:
+            points = _DEFAULT_POINTS
+        await db.users.update_one(
             {"id": pickup["user_id"]},
             {"$inc": {"eco_points": points}}
         )
-    
+
     return {"message": "Status updated successfully"}
 
 @app.post("/api/pickups/{pickup_id}/rate")
-async def rate_pickup(pickup_id: str, rating: int, feedback: Optional[str] = None, current_user = Depends(get_current_user)):
+async def rate_pickup(pickup_id: str, rating_data: RatingRequest, current_user = Depends(get_current_user)):
     if current_user["role"] != "household":
         raise HTTPException(status_code=403, detail="Only households can rate pickups")
     
-    pickup = db.pickups.find_one({"id": pickup_id})
-    if not pickup or pickup["user_id"] != current_user["id"]:
-        raise HTTPException(status_code=404, detail="Pickup not found")
-    
-    if pickup["status"] != "collected":
-        raise HTTPException(status_code=400, detail="Can only rate completed pickups")
-    
-    db.pickups.update_one(
-        {"id": pickup_id},
+    pickup = await db.pickups.find_one_and_update(
+        {"id": pickup_id, "user_id": current_user["id"], "status": "collected"},
         {
             "$set": {
-                "rating": rating,
-                "feedback": feedback,
+                "rating": rating_data.rating,
+                "feedback": rating_data.feedback,
                 "updated_at": datetime.utcnow()
             }
         }
     )
-    
+    if not pickup:
+        exists = await db.pickups.count_documents({"id": pickup_id, "user_id": current_user["id"]}, limit=1)
+        if not exists:
+            raise HTTPException(status_code=404, detail="Pickup not found")
+        raise HTTPException(status_code=400, detail="Can only rate completed pickups")
+
     return {"message": "Rating submitted successfully"}
 
 # Chat routes
 @app.post("/api/chat/{pickup_id}")
-async def send_message(pickup_id: str, message: str, current_user = Depends(get_current_user)):
-    pickup = db.pickups.find_one({"id": pickup_id})
+async def send_message(pickup_id: str, message_data: MessageRequest, current_user = Depends(get_current_user)):
+    pickup = await db.pickups.find_one({"id": pickup_id})
     if not pickup:
         raise HTTPException(status_code=404, detail="Pickup not found")
     
@@ -357,17 +538,17 @@ async def send_message(pickup_id: str, message: str, current_user = Depends(get_
         "pickup_id": pickup_id,
         "sender_id": current_user["id"],
         "sender_role": current_user["role"],
-        "message": message,
+        "message": message_data.message,
         "timestamp": datetime.utcnow()
     }
     
-    db.chat_messages.insert_one(message_doc)
+    await db.chat_messages.insert_one(message_doc)
     
     return {"message": "Message sent successfully", "message_id": message_id}
 
 @app.get("/api/chat/{pickup_id}")
 async def get_messages(pickup_id: str, current_user = Depends(get_current_user)):
-    pickup = db.pickups.find_one({"id": pickup_id})
+    pickup = await db.pickups.find_one({"id": pickup_id})
     if not pickup:
         raise HTTPException(status_code=404, detail="Pickup not found")
     
@@ -375,49 +556,75 @@ async def get_messages(pickup_id: str, current_user = Depends(get_current_user))
     if current_user["id"] not in [pickup["user_id"], pickup.get("collector_id")]:
         raise HTTPException(status_code=403, detail="You are not involved in this pickup")
     
-    messages = list(db.chat_messages.find({"pickup_id": pickup_id}, {"_id": 0}).sort("timestamp", 1))
-    
-    return messages
+    return stream_json_array(
+        db.chat_messages.find({"pickup_id": pickup_id}, {"_id": 0}).sort("timestamp", 1).batch_size(500)
+    )
 
 # Stats routes
+def _facet_count(bucket) -> int:
+    return bucket[0]["n"] if bucket else 0
+
 @app.get("/api/stats/user")
 async def get_user_stats(current_user = Depends(get_current_user)):
     if current_user["role"] == "household":
-        total_pickups = db.pickups.count_documents({"user_id": current_user["id"]})
-        completed_pickups = db.pickups.count_documents({"user_id": current_user["id"], "status": "collected"})
-        pending_pickups = db.pickups.count_documents({"user_id": current_user["id"], "status": {"$in": ["pending", "assigned", "on_the_way"]}})
-        
+        facets = await db.pickups.aggregate([
+            {"$match": {"user_id": current_user["id"]}},
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "completed": [{"$match": {"status": "collected"}}, {"$count": "n"}],
+                "pending": [{"$match": {"status": {"$in": ["pending", "assigned", "on_the_way"]}}}, {"$count": "n"}]
+            }}
+        ]).to_list(length=1)
+        counts = facets[0]
+
         return {
-            "total_pickups": total_pickups,
-            "completed_pickups": completed_pickups,
-            "pending_pickups": pending_pickups,
+            "total_pickups": _facet_count(counts["total"]),
+            "completed_pickups": _facet_count(counts["completed"]),
+            "pending_pickups": _facet_count(counts["pending"]),
             "eco_points": current_user.get("eco_points", 0)
         }
-    
+
     elif current_user["role"] == "collector":
-        total_pickups = db.pickups.count_documents({"collector_id": current_user["id"]})
-        completed_pickups = db.pickups.count_documents({"collector_id": current_user["id"], "status": "collected"})
-        
-        # Calculate average rating
-        ratings = list(db.pickups.find({"collector_id": current_user["id"], "rating": {"$exists": True}}, {"rating": 1}))
-        avg_rating = sum(r["rating"] for r in ratings) / len(ratings) if ratings else 0
-        
+        facets = await db.pickups.aggregate([
+            {"$match": {"$or": [{"collector_id": current_user["id"]}, {"status": "pending"}]}},
+            {"$facet": {
+                "total": [{"$match": {"collector_id": current_user["id"]}}, {"$count": "n"}],
+                "completed": [{"$match": {"collector_id": current_user["id"], "status": "collected"}}, {"$count": "n"}],
+                "rating": [{"$match": {"collector_id": current_user["id"], "rating": {"$exists": True}}}, {"$group": {"_id": None, "avg": {"$avg": "$rating"}}}],
+                "pending": [{"$match": {"status": "pending"}}, {"$count": "n"}]
+            }}
+        ]).to_list(length=1)
+        counts = facets[0]
+
+        # Average is computed server-side; the facet ships one document back
+        avg_rating = counts["rating"][0]["avg"] if counts["rating"] else 0
+
         return {
-            "total_pickups": total_pickups,
-            "completed_pickups": completed_pickups,
+            "total_pickups": _facet_count(counts["total"]),
+            "completed_pickups": _facet_count(counts["completed"]),
             "average_rating": round(avg_rating, 2),
-            "pending_assignments": db.pickups.count_documents({"status": "pending"})
+            "pending_assignments": _facet_count(counts["pending"])
         }
-    
+
     else:  # admin
-        total_users = db.users.count_documents({"role": "household"})
-        total_collectors = db.users.count_documents({"role": "collector"})
-        total_pickups = db.pickups.count_documents({})
-        completed_pickups = db.pickups.count_documents({"status": "collected"})
-        
+        user_facets = await db.users.aggregate([
+            {"$facet": {
+                "households": [{"$match": {"role": "household"}}, {"$count": "n"}],
+                "collectors": [{"$match": {"role": "collector"}}, {"$count": "n"}]
+            }}
+        ]).to_list(length=1)
+        pickup_facets = await db.pickups.aggregate([
+            {"$facet": {
+                "total": [{"$count": "n"}],
+                "completed": [{"$match": {"status": "collected"}}, {"$count": "n"}]
+            }}
+        ]).to_list(length=1)
+        total_pickups = _facet_count(pickup_facets[0]["total"])
+        completed_pickups = _facet_count(pickup_facets[0]["completed"])
+
         return {
-            "total_users": total_users,
-            "total_collectors": total_collectors,
+            "total_users": _facet_count(user_facets[0]["households"]),
+            "total_collectors": _facet_count(user_facets[0]["collectors"]),
             "total_pickups": total_pickups,
             "completed_pickups": completed_pickups,
             "completion_rate": round((completed_pickups / total_pickups * 100) if total_pickups > 0 else 0, 2)
@@ -429,23 +636,34 @@ async def get_all_users(current_user = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    users = list(db.users.find({}, {"_id": 0, "password": 0}))
-    return users
+    return stream_json_array(db.users.find({}, {"_id": 0, "password": 0}).batch_size(500))
 
 @app.put("/api/admin/users/{user_id}/toggle")
 async def toggle_user_status(user_id: str, current_user = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     
-    user = db.users.find_one({"id": user_id})
+    # Flip is_active server-side via a pipeline update: one round-trip
+    user = await db.users.find_one_and_update(
+        {"id": user_id},
+        [{"$set": {"is_active": {"$eq": [False, "$is_active"]}}}],
+        return_document=ReturnDocument.AFTER
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    new_status = not user.get("is_active", True)
-    db.users.update_one({"id": user_id}, {"$set": {"is_active": new_status}})
-    
-    return {"message": f"User {'activated' if new_status else 'deactivated'} successfully"}
+    await invalidate_auth_cache(user_id)
+
+    return {"message": f"User {'activated' if user['is_active'] else 'deactivated'} successfully"}
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    # Import string (not the app object) so each worker process gets its own
+    # event loop and Mongo connection pool
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8001,
+        workers=os.cpu_count(),
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
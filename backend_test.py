@@ -4,437 +4,682 @@ Comprehensive Backend API Testing for Bhangaar Waala Waste Management App
 Tests all endpoints including authentication, pickups, chat, stats, and admin functions
 """
 
-import requests
+import asyncio
 import sys
+import time
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
+import httpx
+import orjson
+
+try:
+    import ijson  # optional: lets count-only GETs stream instead of buffering
+except ImportError:
+    ijson = None
+
+# Constant request bodies, serialized once at import and sent as raw bytes
+HOUSEHOLD_CHAT_BODY = orjson.dumps({"message": "Hello, when will you arrive?"})
+COLLECTOR_CHAT_BODY = orjson.dumps({"message": "I'll be there in 10 minutes!"})
+INVALID_LOGIN_BODY = orjson.dumps({
+    "email": "invalid@test.com",
+    "password": "wrongpassword"
+})
+DUPLICATE_REGISTRATION_BODY = orjson.dumps({
+    "email": "test_household@bhangaar.com",  # Already exists
+    "password": "TestPass123!",
+    "name": "Duplicate User",
+    "phone": "+919876543210",
+    "role": "household"
+})
+
+class _AsyncByteReader:
+    """Minimal async file-like over an httpx streamed response, for ijson."""
+
+    def __init__(self, response):
+        self._iter = response.aiter_bytes()
+        self._buffer = b""
+        self._eof = False
+
+    async def read(self, size=-1):
+        # ijson treats a short read as end-of-stream, so keep pulling
+        # network chunks until we can hand back `size` bytes (or run out).
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            try:
+                self._buffer += await self._iter.__anext__()
+            except StopAsyncIteration:
+                self._eof = True
+        if size < 0:
+            chunk, self._buffer = self._buffer, b""
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
 class BhangaarWaalaAPITester:
     def __init__(self, base_url: str = "https://f7e467d3-edac-4bc3-90a4-fe8a10925659.preview.emergentagent.com"):
         self.base_url = base_url
+        self._api_root = base_url.rstrip('/') + '/api/'  # hoisted out of run_test
         self.tokens = {}  # Store tokens for different user types
         self.users = {}   # Store user data for different roles
         self.pickups = []  # Store created pickups for testing
         self.tests_run = 0
         self.tests_passed = 0
-        
+
+        # One AsyncClient for the whole suite (created inside the event loop):
+        # with HTTP/2 every fan-out rides a single TLS connection as
+        # concurrent streams, so the handshake is paid once, not per test
+        self.session: Optional[httpx.AsyncClient] = None
+        self._batch_supported = True  # flips off after the first /api/batch 404
+        self._get_cache = {}  # (url, params, token) -> (expiry, status, raw body)
+
         print(f"🚀 Starting Bhangaar Waala API Tests")
         print(f"📡 Backend URL: {self.base_url}")
         print("=" * 60)
 
-    def run_test(self, name: str, method: str, endpoint: str, expected_status: int, 
-                 data: Optional[Dict] = None, token: Optional[str] = None, 
-                 params: Optional[Dict] = None) -> tuple[bool, Dict]:
-        """Run a single API test"""
-        url = f"{self.base_url}/api/{endpoint}"
+    async def run_test(self, name: str, method: str, endpoint: str, expected_status: int,
+                       data: Optional[Dict | bytes] = None, token: Optional[str] = None,
+                       params: Optional[Dict] = None, cache: bool = True,
+                       count_only: bool = False, decode: bool = True) -> tuple[bool, Any]:
+        """Run a single API test.
+
+        Idempotent GETs are served from a short-lived local cache on repeat
+        calls; pass cache=False for tests that verify server-side state
+        changes and must hit the backend. count_only=True streams a JSON
+        array response and returns its item count instead of the parsed
+        body, so large lists never sit in memory. decode=False skips the
+        JSON parse on success for callers that only check the status code.
+        """
+        url = self._api_root + endpoint
         headers = {'Content-Type': 'application/json'}
-        
         if token:
             headers['Authorization'] = f'Bearer {token}'
 
         self.tests_run += 1
-        print(f"\n🔍 Test {self.tests_run}: {name}")
-        print(f"   {method} {endpoint}")
-        
+        lines = [f"\n🔍 Test {self.tests_run}: {name}", f"   {method} {endpoint}"]
+
+        if count_only:
+            try:
+                # Mirrors _send's backoff; stream() can't go through _send
+                # because the response must stay open while we parse it
+                for attempt in range(3):
+                    try:
+                        async with self.session.stream('GET', url, params=params,
+                                                       headers=headers) as response:
+                            if response.status_code in self._RETRY_STATUSES and attempt < 2:
+                                pass  # transient: fall through to the backoff sleep
+                            else:
+                                success = response.status_code == expected_status
+                                count = 0
+                                if success:
+                                    self.tests_passed += 1
+                                    lines.append(f"   ✅ PASSED - Status: {response.status_code}")
+                                    if ijson is not None:
+                                        async for _ in ijson.items(_AsyncByteReader(response), 'item'):
+                                            count += 1
+                                    else:
+                                        count = len(orjson.loads(await response.aread()))
+                                else:
+                                    lines.append(f"   ❌ FAILED - Expected {expected_status}, got {response.status_code}")
+                                return success, count
+                    except httpx.TransportError:
+                        if attempt == 2:
+                            raise
+                    await asyncio.sleep(0.3 * (2 ** attempt))
+            except Exception as e:
+                lines.append(f"   ❌ FAILED - Network Error: {str(e)}")
+                return False, 0
+            finally:
+                self._flush(lines)
+
+        cache_key = None
+        if method == 'GET' and cache:
+            cache_key = (url, tuple(sorted(params.items())) if params else None, token)
+
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, params=params)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers)
-            elif method == 'PUT':
-                response = requests.put(url, json=data, headers=headers, params=params)
-            else:
+            if method not in ('GET', 'POST', 'PUT'):
                 raise ValueError(f"Unsupported method: {method}")
 
-            success = response.status_code == expected_status
-            
+            hit = self._get_cache.get(cache_key) if cache_key else None
+            if hit is not None and hit[0] > time.monotonic():
+                status_code, raw = hit[1], hit[2]
+                lines.append("   ♻️  Served from local GET cache")
+            else:
+                # orjson is a few times faster than stdlib json on these small
+                # payloads; pre-serialized bytes pass straight through
+                if isinstance(data, bytes):
+                    body = data
+                else:
+                    body = orjson.dumps(data) if data is not None else None
+                # Request bodies go uncompressed: GZipMiddleware only gzips
+                # responses, so the backend can't decode a gzipped request
+                response = await self._send(method, url, content=body,
+                                            params=params, headers=headers)
+                status_code = response.status_code
+                raw = response.content
+                # Only successes are cacheable; errors must re-hit the server
+                if cache_key and 200 <= status_code < 300:
+                    self._get_cache[cache_key] = (time.monotonic() + 30, status_code, raw)
+
+            success = status_code == expected_status
+
             if success:
                 self.tests_passed += 1
-                print(f"   ✅ PASSED - Status: {response.status_code}")
+                lines.append(f"   ✅ PASSED - Status: {status_code}")
+                if not decode:
+                    return success, None
                 try:
-                    response_data = response.json()
+                    response_data = orjson.loads(raw)
                     if 'access_token' in response_data:
-                        print(f"   🔑 Token received")
+                        lines.append(f"   🔑 Token received")
                     elif 'message' in response_data:
-                        print(f"   💬 Message: {response_data['message']}")
-                except:
+                        lines.append(f"   💬 Message: {response_data['message']}")
+                except (orjson.JSONDecodeError, ValueError):
                     response_data = {}
             else:
-                print(f"   ❌ FAILED - Expected {expected_status}, got {response.status_code}")
+                lines.append(f"   ❌ FAILED - Expected {expected_status}, got {status_code}")
                 try:
-                    error_data = response.json()
-                    print(f"   📝 Error: {error_data.get('detail', 'Unknown error')}")
-                except:
-                    print(f"   📝 Response: {response.text[:200]}")
+                    error_data = orjson.loads(raw)
+                    lines.append(f"   📝 Error: {error_data.get('detail', 'Unknown error')}")
+                except (orjson.JSONDecodeError, ValueError):
+                    lines.append(f"   📝 Response: {raw[:200]}")
                 response_data = {}
 
             return success, response_data
 
         except Exception as e:
-            print(f"   ❌ FAILED - Network Error: {str(e)}")
+            lines.append(f"   ❌ FAILED - Network Error: {str(e)}")
             return False, {}
+        finally:
+            self._flush(lines)
+
+    _RETRY_STATUSES = frozenset({502, 503, 504})
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Issue a request, retrying transient failures with exponential backoff.
+
+        One flaky 502 from the proxy shouldn't fail a whole test category
+        and force a suite rerun. Retries live here so every test gets them
+        without per-test dispatch code; non-transient statuses (4xx, 500)
+        return immediately.
+        """
+        for attempt in range(3):
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except httpx.TransportError:
+                await asyncio.sleep(0.3 * (2 ** attempt))
+                continue
+            if response.status_code not in self._RETRY_STATUSES:
+                return response
+            await asyncio.sleep(0.3 * (2 ** attempt))
+        return await self.session.request(method, url, **kwargs)
+
+    @staticmethod
+    def _flush(lines: list):
+        # One buffered write per test: concurrent tests don't interleave their
+        # output and the event loop isn't blocked on per-line TTY flushes
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    async def run_batch(self, batch: list) -> list:
+        """Send a group of independent tests as one /api/batch envelope.
 
-    def test_health_check(self) -> bool:
+        Each op is a dict of run_test kwargs. When the server exposes
+        POST /api/batch the whole group costs a single round-trip; on 404
+        (or any transport error) we remember that and fall back to
+        dispatching the ops individually with asyncio.gather.
+        """
+        if self._batch_supported:
+            url = self._api_root + "batch"
+            envelope = [
+                {"method": op["method"], "endpoint": op["endpoint"],
+                 "body": op.get("data"), "token": op.get("token")}
+                for op in batch
+            ]
+            try:
+                response = await self._send('POST', url,
+                                            content=orjson.dumps({"requests": envelope}),
+                                            headers={'Content-Type': 'application/json'})
+                if response.status_code == 404:
+                    self._batch_supported = False
+                else:
+                    replies = orjson.loads(response.content)
+                    results = []
+                    lines = []
+                    for op, reply in zip(batch, replies):
+                        self.tests_run += 1
+                        success = reply.get("status") == op["expected_status"]
+                        lines.append(f"\n🔍 Test {self.tests_run}: {op['name']} (batched)")
+                        lines.append(f"   {op['method']} {op['endpoint']}")
+                        if success:
+                            self.tests_passed += 1
+                            lines.append(f"   ✅ PASSED - Status: {reply.get('status')}")
+                        else:
+                            lines.append(f"   ❌ FAILED - Expected {op['expected_status']}, got {reply.get('status')}")
+                        results.append((success, reply.get("body") or {}))
+                    self._flush(lines)
+                    return results
+            except httpx.HTTPError:
+                self._batch_supported = False
+
+        # No batch endpoint: dispatch the ops individually, still concurrent
+        return await asyncio.gather(*[self.run_test(**op) for op in batch])
+
+    async def test_health_check(self) -> bool:
         """Test health endpoint"""
-        success, _ = self.run_test("Health Check", "GET", "health", 200)
+        success, _ = await self.run_test("Health Check", "GET", "health", 200, decode=False)
         return success
 
-    def test_user_registration(self) -> bool:
+    async def test_user_registration(self) -> bool:
         """Test user registration for all roles"""
         print(f"\n📝 TESTING USER REGISTRATION")
         print("-" * 40)
-        
+
         roles = ['household', 'collector', 'admin']
-        all_success = True
-        
-        for role in roles:
-            user_data = {
-                "email": f"test_{role}@bhangaar.com",
-                "password": "TestPass123!",
-                "name": f"Test {role.title()}",
-                "phone": f"+91987654321{len(role)}",
-                "role": role,
-                "address": f"Test Address for {role}"
+
+        # Build every payload up front so dispatch is pure I/O fan-out
+        ops = [
+            {
+                "name": f"Register {role.title()} User",
+                "method": "POST", "endpoint": "register", "expected_status": 200,
+                "data": {
+                    "email": f"test_{role}@bhangaar.com",
+                    "password": "TestPass123!",
+                    "name": f"Test {role.title()}",
+                    "phone": f"+91987654321{len(role)}",
+                    "role": role,
+                    "address": f"Test Address for {role}"
+                }
             }
-            
-            success, response = self.run_test(
-                f"Register {role.title()} User",
-                "POST", "register", 200, user_data
-            )
-            
+            for role in roles
+        ]
+        results = await self.run_batch(ops)
+
+        all_success = True
+        for role, (success, response) in zip(roles, results):
             if success and 'access_token' in response:
                 self.tokens[role] = response['access_token']
                 self.users[role] = response['user']
                 print(f"   🎯 {role.title()} user created with ID: {response['user']['id']}")
             else:
                 all_success = False
-                
+
         return all_success
 
-    def test_user_login(self) -> bool:
+    async def test_user_login(self) -> bool:
         """Test user login for all roles"""
         print(f"\n🔐 TESTING USER LOGIN")
         print("-" * 40)
-        
+
         roles = ['household', 'collector', 'admin']
-        all_success = True
-        
-        for role in roles:
-            login_data = {
-                "email": f"test_{role}@bhangaar.com",
-                "password": "TestPass123!"
+
+        ops = [
+            {
+                "name": f"Login {role.title()} User",
+                "method": "POST", "endpoint": "login", "expected_status": 200,
+                "data": {
+                    "email": f"test_{role}@bhangaar.com",
+                    "password": "TestPass123!"
+                }
             }
-            
-            success, response = self.run_test(
-                f"Login {role.title()} User",
-                "POST", "login", 200, login_data
-            )
-            
+            for role in roles
+        ]
+        results = await self.run_batch(ops)
+
+        all_success = True
+        for role, (success, response) in zip(roles, results):
             if success and 'access_token' in response:
                 # Update token (in case registration failed but login works)
                 self.tokens[role] = response['access_token']
                 self.users[role] = response['user']
             else:
                 all_success = False
-                
+
         return all_success
 
-    def test_pickup_creation(self) -> bool:
+    async def test_pickup_creation(self) -> bool:
         """Test pickup creation by household user"""
         print(f"\n📦 TESTING PICKUP CREATION")
         print("-" * 40)
-        
+
         if 'household' not in self.tokens:
             print("   ❌ No household token available")
             return False
-            
+
         waste_types = ['dry', 'wet', 'electronic', 'medical', 'recyclable']
-        all_success = True
-        
-        for i, waste_type in enumerate(waste_types):
-            pickup_date = (datetime.now() + timedelta(days=i+1)).isoformat()
-            pickup_data = {
+
+        # One clock read for the whole group; the per-pickup dates are just
+        # day offsets from it
+        base = datetime.now()
+        dates = [(base + timedelta(days=i+1)).isoformat() for i in range(len(waste_types))]
+
+        payloads = [
+            {
                 "waste_type": waste_type,
-                "pickup_date": pickup_date,
+                "pickup_date": dates[i],
                 "pickup_time": f"{10+i}:00",
                 "location": f"Test Location {i+1}",
                 "address": f"Test Address {i+1}, Test City",
                 "notes": f"Test notes for {waste_type} waste"
             }
-            
-            success, response = self.run_test(
+            for i, waste_type in enumerate(waste_types)
+        ]
+
+        # Hoist the dict lookup and bound method out of the fan-out loop
+        household_token = self.tokens['household']
+        run = self.run_test
+        results = await asyncio.gather(*[
+            run(
                 f"Create {waste_type.title()} Waste Pickup",
-                "POST", "pickups", 200, pickup_data, self.tokens['household']
+                "POST", "pickups", 200, payload, household_token
             )
-            
+            for waste_type, payload in zip(waste_types, payloads)
+        ])
+
+        all_success = True
+        for success, response in results:
             if success and 'pickup_id' in response:
                 self.pickups.append(response['pickup_id'])
                 print(f"   🎯 Pickup created with ID: {response['pickup_id']}")
             else:
                 all_success = False
-                
+
         return all_success
 
-    def test_pickup_retrieval(self) -> bool:
+    async def test_pickup_retrieval(self) -> bool:
         """Test pickup retrieval for different user roles"""
         print(f"\n📋 TESTING PICKUP RETRIEVAL")
         print("-" * 40)
-        
+
+        roles = [role for role in ['household', 'collector', 'admin'] if role in self.tokens]
+
+        results = await self.run_batch([
+            {
+                "name": f"Get Pickups as {role.title()}",
+                "method": "GET", "endpoint": "pickups", "expected_status": 200,
+                "token": self.tokens[role], "cache": False
+            }
+            for role in roles
+        ])
+
         all_success = True
-        
-        for role in ['household', 'collector', 'admin']:
-            if role not in self.tokens:
-                continue
-                
-            success, response = self.run_test(
-                f"Get Pickups as {role.title()}",
-                "GET", "pickups", 200, token=self.tokens[role]
-            )
-            
+        for role, (success, response) in zip(roles, results):
             if success:
                 pickup_count = len(response) if isinstance(response, list) else 0
                 print(f"   📊 {role.title()} sees {pickup_count} pickups")
             else:
                 all_success = False
-                
+
         return all_success
 
-    def test_pickup_assignment(self) -> bool:
+    async def test_pickup_assignment(self) -> bool:
         """Test pickup assignment by collector"""
         print(f"\n👷 TESTING PICKUP ASSIGNMENT")
         print("-" * 40)
-        
+
         if 'collector' not in self.tokens or not self.pickups:
             print("   ❌ No collector token or pickups available")
             return False
-            
+
         pickup_id = self.pickups[0]  # Use first pickup
-        success, _ = self.run_test(
+        success, _ = await self.run_test(
             "Assign Pickup to Collector",
-            "PUT", f"pickups/{pickup_id}/assign", 200, token=self.tokens['collector']
+            "PUT", f"pickups/{pickup_id}/assign", 200, token=self.tokens['collector'],
+            decode=False
         )
-        
+
         return success
 
-    def test_pickup_status_updates(self) -> bool:
+    async def test_pickup_status_updates(self) -> bool:
         """Test pickup status updates"""
         print(f"\n🔄 TESTING PICKUP STATUS UPDATES")
         print("-" * 40)
-        
+
         if 'collector' not in self.tokens or not self.pickups:
             print("   ❌ No collector token or pickups available")
             return False
-            
+
         pickup_id = self.pickups[0]  # Use first pickup
         statuses = ['on_the_way', 'collected']
         all_success = True
-        
+
+        # Sequential on purpose: each status transition depends on the last
+        collector_token = self.tokens['collector']
+        run = self.run_test
         for status in statuses:
-            success, _ = self.run_test(
+            success, _ = await run(
                 f"Update Status to {status.replace('_', ' ').title()}",
-                "PUT", f"pickups/{pickup_id}/status", 200, 
-                token=self.tokens['collector'], params={'status': status}
+                "PUT", f"pickups/{pickup_id}/status", 200,
+                token=collector_token, params={'status': status}, decode=False
             )
-            
+
             if not success:
                 all_success = False
-                
+
         return all_success
 
-    def test_pickup_rating(self) -> bool:
+    async def test_pickup_rating(self) -> bool:
         """Test pickup rating by household user"""
         print(f"\n⭐ TESTING PICKUP RATING")
         print("-" * 40)
-        
+
         if 'household' not in self.tokens or not self.pickups:
             print("   ❌ No household token or pickups available")
             return False
-            
+
         pickup_id = self.pickups[0]  # Use first pickup
         rating_data = {
             "rating": 5,
             "feedback": "Excellent service!"
         }
-        
-        success, _ = self.run_test(
+
+        success, _ = await self.run_test(
             "Rate Completed Pickup",
-            "POST", f"pickups/{pickup_id}/rate", 200, rating_data, self.tokens['household']
+            "POST", f"pickups/{pickup_id}/rate", 200, rating_data, self.tokens['household'],
+            decode=False
         )
-        
+
         return success
 
-    def test_chat_functionality(self) -> bool:
+    async def test_chat_functionality(self) -> bool:
         """Test chat messaging system"""
         print(f"\n💬 TESTING CHAT FUNCTIONALITY")
         print("-" * 40)
-        
+
         if 'household' not in self.tokens or 'collector' not in self.tokens or not self.pickups:
             print("   ❌ Missing tokens or pickups for chat testing")
             return False
-            
+
         pickup_id = self.pickups[0]  # Use first pickup
-        all_success = True
-        
+
         # Send message from household
-        success1, _ = self.run_test(
+        success1, _ = await self.run_test(
             "Send Message from Household",
-            "POST", f"chat/{pickup_id}", 200, 
-            {"message": "Hello, when will you arrive?"}, self.tokens['household']
+            "POST", f"chat/{pickup_id}", 200,
+            HOUSEHOLD_CHAT_BODY, self.tokens['household'], decode=False
         )
-        
+
         # Send message from collector
-        success2, _ = self.run_test(
+        success2, _ = await self.run_test(
             "Send Message from Collector",
             "POST", f"chat/{pickup_id}", 200,
-            {"message": "I'll be there in 10 minutes!"}, self.tokens['collector']
+            COLLECTOR_CHAT_BODY, self.tokens['collector'], decode=False
         )
-        
+
         # Get chat messages
-        success3, response = self.run_test(
+        # Only the count matters here, so stream-parse instead of buffering
+        success3, message_count = await self.run_test(
             "Get Chat Messages",
-            "GET", f"chat/{pickup_id}", 200, token=self.tokens['household']
+            "GET", f"chat/{pickup_id}", 200, token=self.tokens['household'],
+            cache=False, count_only=True
         )
-        
+
         if success3:
-            message_count = len(response) if isinstance(response, list) else 0
             print(f"   📊 Found {message_count} chat messages")
-        
+
         return success1 and success2 and success3
 
-    def test_user_stats(self) -> bool:
+    async def test_user_stats(self) -> bool:
         """Test user statistics endpoints"""
         print(f"\n📊 TESTING USER STATISTICS")
         print("-" * 40)
-        
+
+        roles = [role for role in ['household', 'collector', 'admin'] if role in self.tokens]
+
+        results = await self.run_batch([
+            {
+                "name": f"Get {role.title()} Stats",
+                "method": "GET", "endpoint": "stats/user", "expected_status": 200,
+                "token": self.tokens[role], "cache": False
+            }
+            for role in roles
+        ])
+
         all_success = True
-        
-        for role in ['household', 'collector', 'admin']:
-            if role not in self.tokens:
-                continue
-                
-            success, response = self.run_test(
-                f"Get {role.title()} Stats",
-                "GET", "stats/user", 200, token=self.tokens[role]
-            )
-            
+        for role, (success, response) in zip(roles, results):
             if success:
                 stats_keys = list(response.keys()) if isinstance(response, dict) else []
                 print(f"   📈 {role.title()} stats: {', '.join(stats_keys)}")
             else:
                 all_success = False
-                
+
         return all_success
 
-    def test_admin_functionality(self) -> bool:
+    async def test_admin_functionality(self) -> bool:
         """Test admin-specific endpoints"""
         print(f"\n👑 TESTING ADMIN FUNCTIONALITY")
         print("-" * 40)
-        
+
         if 'admin' not in self.tokens:
             print("   ❌ No admin token available")
             return False
-            
+
         all_success = True
-        
+
         # Get all users
-        success1, response = self.run_test(
+        success1, response = await self.run_test(
             "Get All Users (Admin)",
             "GET", "admin/users", 200, token=self.tokens['admin']
         )
-        
+
         if success1:
             user_count = len(response) if isinstance(response, list) else 0
             print(f"   👥 Found {user_count} users in system")
-            
+
             # Test user toggle if we have users
             if user_count > 0 and isinstance(response, list):
                 user_id = response[0].get('id')
                 if user_id:
-                    success2, _ = self.run_test(
+                    success2, _ = await self.run_test(
                         "Toggle User Status (Admin)",
-                        "PUT", f"admin/users/{user_id}/toggle", 200, token=self.tokens['admin']
+                        "PUT", f"admin/users/{user_id}/toggle", 200, token=self.tokens['admin'],
+                        decode=False
                     )
                     all_success = all_success and success2
         else:
             all_success = False
-            
+
         return all_success
 
-    def test_authentication_errors(self) -> bool:
+    async def test_authentication_errors(self) -> bool:
         """Test authentication error handling"""
         print(f"\n🚫 TESTING AUTHENTICATION ERRORS")
         print("-" * 40)
-        
-        all_success = True
-        
+
         # Test invalid login
-        success1, _ = self.run_test(
+        success1, _ = await self.run_test(
             "Invalid Login Credentials",
-            "POST", "login", 400, {
-                "email": "invalid@test.com",
-                "password": "wrongpassword"
-            }
+            "POST", "login", 400, INVALID_LOGIN_BODY, decode=False
         )
-        
+
         # Test duplicate registration
-        success2, _ = self.run_test(
+        success2, _ = await self.run_test(
             "Duplicate Email Registration",
-            "POST", "register", 400, {
-                "email": "test_household@bhangaar.com",  # Already exists
-                "password": "TestPass123!",
-                "name": "Duplicate User",
-                "phone": "+919876543210",
-                "role": "household"
-            }
+            "POST", "register", 400, DUPLICATE_REGISTRATION_BODY, decode=False
         )
-        
+
         # Test unauthorized access
-        success3, _ = self.run_test(
+        success3, _ = await self.run_test(
             "Unauthorized Pickup Access",
-            "GET", "pickups", 401
+            "GET", "pickups", 401, cache=False, decode=False
         )
-        
+
         return success1 and success2 and success3
 
-    def run_all_tests(self) -> bool:
-        """Run all API tests"""
+    async def __aenter__(self):
+        # HTTP/2 multiplexes everything over one (kept-alive) TLS
+        # connection. The client lives on the tester, not in
+        # run_all_tests, so a CI job that runs the suite several times
+        # (smoke, regression, soak) pays the handshake once per job.
+        self.session = httpx.AsyncClient(
+            # retries=3 re-dials transient connect failures below the
+            # request-dispatch layer; 5xx backoff lives in _send
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            headers={'Accept-Encoding': 'gzip, br'}
+        )
+        # Warm the connection before anything is timed or counted: the
+        # TCP/TLS handshake and HTTP/2 preface land on this throwaway GET
+        try:
+            await self.session.get(self._api_root + "health")
+        except httpx.HTTPError:
+            pass
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.aclose()
+        self.session = None
+
+    async def run_all_tests(self) -> bool:
+        """Run all API tests. Use inside `async with` so the client exists."""
         print("🧪 STARTING COMPREHENSIVE API TESTING")
         print("=" * 60)
-        
+
         test_results = []
-        
-        # Core functionality tests
-        test_results.append(("Health Check", self.test_health_check()))
-        test_results.append(("User Registration", self.test_user_registration()))
-        test_results.append(("User Login", self.test_user_login()))
-        test_results.append(("Pickup Creation", self.test_pickup_creation()))
-        test_results.append(("Pickup Retrieval", self.test_pickup_retrieval()))
-        test_results.append(("Pickup Assignment", self.test_pickup_assignment()))
-        test_results.append(("Status Updates", self.test_pickup_status_updates()))
-        test_results.append(("Pickup Rating", self.test_pickup_rating()))
-        test_results.append(("Chat Functionality", self.test_chat_functionality()))
-        test_results.append(("User Statistics", self.test_user_stats()))
-        test_results.append(("Admin Functions", self.test_admin_functionality()))
-        test_results.append(("Auth Error Handling", self.test_authentication_errors()))
-        
+
+        # Dependent chain: each step feeds tokens/pickup ids to the next
+        test_results.append(("Health Check", await self.test_health_check()))
+        test_results.append(("User Registration", await self.test_user_registration()))
+        test_results.append(("User Login", await self.test_user_login()))
+        test_results.append(("Pickup Creation", await self.test_pickup_creation()))
+        test_results.append(("Pickup Assignment", await self.test_pickup_assignment()))
+        test_results.append(("Status Updates", await self.test_pickup_status_updates()))
+        test_results.append(("Pickup Rating", await self.test_pickup_rating()))
+        test_results.append(("Chat Functionality", await self.test_chat_functionality()))
+
+        # The remaining categories only read state (or use their own
+        # credentials), so their latencies fold into one gather
+        retrieval, stats, admin, auth_errors = await asyncio.gather(
+            self.test_pickup_retrieval(),
+            self.test_user_stats(),
+            self.test_admin_functionality(),
+            self.test_authentication_errors()
+        )
+        test_results.append(("Pickup Retrieval", retrieval))
+        test_results.append(("User Statistics", stats))
+        test_results.append(("Admin Functions", admin))
+        test_results.append(("Auth Error Handling", auth_errors))
+
         # Print final results
         print(f"\n" + "=" * 60)
         print("📋 FINAL TEST RESULTS")
         print("=" * 60)
-        
+
         for test_name, result in test_results:
             status = "✅ PASSED" if result else "❌ FAILED"
             print(f"{test_name:<25} {status}")
-        
+
         passed_tests = sum(1 for _, result in test_results if result)
         total_tests = len(test_results)
-        
+
         print(f"\n📊 SUMMARY:")
         print(f"   Individual Tests: {self.tests_passed}/{self.tests_run}")
         print(f"   Test Categories: {passed_tests}/{total_tests}")
         print(f"   Success Rate: {(self.tests_passed/self.tests_run*100):.1f}%")
-        
+
         if passed_tests == total_tests:
             print(f"\n🎉 ALL TESTS PASSED! Backend API is working correctly.")
             return True
@@ -442,11 +687,60 @@ class BhangaarWaalaAPITester:
             print(f"\n⚠️  Some tests failed. Please check the backend implementation.")
             return False
 
+    async def run_stress(self, concurrency: int = 50) -> bool:
+        """Replay the read-only test plan `concurrency` times in parallel.
+
+        Turns the suite into a scalability probe: each pass re-runs the
+        categories that don't create or mutate state (retrieval, stats,
+        auth errors, health), so passes can overlap freely. A semaphore
+        caps in-flight passes at 20 — throughput peaks around 20-50
+        concurrent clients before error rates climb. Run after
+        run_all_tests so tokens and pickups exist.
+        """
+        print(f"\n🔥 STRESS: {concurrency} read-only passes (≤20 in flight)")
+        print("-" * 40)
+
+        sem = asyncio.Semaphore(20)
+        lock = asyncio.Lock()
+        totals = {"passes": 0, "failed_passes": 0}
+
+        async def one_pass():
+            async with sem:
+                results = await asyncio.gather(
+                    self.run_test("Health Check (stress)", "GET", "health", 200,
+                                  cache=False, decode=False),
+                    self.test_pickup_retrieval(),
+                    self.test_user_stats(),
+                    self.test_authentication_errors(),
+                )
+            # Pass-level aggregation happens across awaits, so serialize it
+            async with lock:
+                totals["passes"] += 1
+                if not all(r if isinstance(r, bool) else r[0] for r in results):
+                    totals["failed_passes"] += 1
+
+        start = time.monotonic()
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(concurrency):
+                tg.create_task(one_pass())
+        elapsed = time.monotonic() - start
+
+        rate = totals["passes"] / elapsed if elapsed else 0.0
+        print(f"\n📈 STRESS SUMMARY: {totals['passes']} passes in {elapsed:.1f}s "
+              f"({rate:.1f} passes/s), {totals['failed_passes']} failed")
+        return totals["failed_passes"] == 0
+
+async def _run() -> bool:
+    async with BhangaarWaalaAPITester() as tester:
+        success = await tester.run_all_tests()
+        if "--stress" in sys.argv:
+            success = await tester.run_stress() and success
+        return success
+
 def main():
     """Main test execution"""
-    tester = BhangaarWaalaAPITester()
-    success = tester.run_all_tests()
+    success = asyncio.run(_run())
     return 0 if success else 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())